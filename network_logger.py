@@ -0,0 +1,267 @@
+import time
+import csv
+import io
+import os
+import atexit
+from datetime import datetime
+import subprocess
+import statistics
+import requests
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import re
+
+# Shared pool for the logging loops, stop_event lets them exit cleanly on Ctrl+C
+executor = ThreadPoolExecutor(max_workers=4)
+stop_event = threading.Event()
+
+_RSSI_RE = re.compile(r'RSSI\s+:\s+([-+]?\d+)\s+dBm')
+_TIME_RE = re.compile(r'time=(\d+\.\d+) ms')
+_TIMEOUT_RE = re.compile(r'Request timeout for icmp_seq')
+
+# Speed test against a fixed mirror, reusing one pooled connection across runs
+DOWNLOAD_URL = 'https://speed.cloudflare.com/__down'
+UPLOAD_URL = 'https://speed.cloudflare.com/__up'
+DOWNLOAD_BYTES = 25_000_000
+UPLOAD_BYTES = 10_000_000
+# Each direction stops after this long, so slow links don't stall the cycle or saturate the link
+TRANSFER_SECONDS = 10
+CHUNK_BYTES = 1 << 16
+_session = requests.Session()
+_upload_chunk = bytes(CHUNK_BYTES)
+
+def get_connected_wifi_signal_strength():
+    try:
+        output = subprocess.check_output(['sudo', 'wdutil', 'info'], stderr=subprocess.STDOUT, text=True)
+        match = _RSSI_RE.search(output)
+
+        if match:
+            rssi = int(match.group(1))
+            strength = max(0, min(100, (rssi + 100) * 2))
+            print(f"RSSI: {rssi} dBm, Strength: {strength}%")
+            return rssi, strength
+
+        print("RSSI value not found in the output.")
+        return None, None
+
+    except subprocess.CalledProcessError as e:
+        print(f"Command failed with error: {e.output}")
+        return None, None
+    except Exception as e:
+        print(f"An unexpected error occurred: {str(e)}")
+        return None, None
+
+# Runs one long-lived ping process at 1s, each stats call covers the ~5 results since the previous call
+class PingMonitor:
+    def __init__(self, host="8.8.8.8", interval=1):
+        self.host = host
+        self.interval = interval
+        self.samples = []  # results since the last get_ping_stats call, reply time in ms or None for a lost packet
+        self.lock = threading.Lock()
+        self.proc = None
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            ['ping', '-i', str(self.interval), self.host],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        try:
+            executor.submit(self._read_replies, self.proc).add_done_callback(report_failure)
+        except RuntimeError:
+            # Pool already shut down, don't leave a ping running with nothing reading it
+            self.proc.terminate()
+
+    def _read_replies(self, proc):
+        for line in proc.stdout:
+            reply_match = _TIME_RE.search(line)
+            if reply_match:
+                sample = float(reply_match.group(1))
+            elif _TIMEOUT_RE.search(line):
+                sample = None
+            else:
+                continue
+            with self.lock:
+                self.samples.append(sample)
+
+    def stop(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.terminate()
+
+    def get_ping_stats(self):
+        if self.proc.poll() is not None:
+            # Don't race Ctrl+C, the executor refuses new work once it is shutting down
+            if not stop_event.is_set():
+                print(f"\nping exited with code {self.proc.returncode}, restarting")
+                self.start()
+            return None
+
+        with self.lock:
+            samples = self.samples
+            self.samples = []
+
+        times = [t for t in samples if t is not None]
+        # No row while the link is down, the visualizer fills these gaps as 100% loss
+        if not times:
+            return None
+
+        return {
+            'min': min(times),
+            'max': max(times),
+            'avg': statistics.mean(times),
+            'packet_loss': 100.0 * (len(samples) - len(times)) / len(samples)
+        }
+
+def _latency_ms():
+    response = _session.get(DOWNLOAD_URL, params={'bytes': 0}, timeout=10)
+    response.raise_for_status()
+    return response.elapsed.total_seconds() * 1000
+
+def _upload_body(deadline, sent):
+    # Stream fixed chunks until the byte cap or deadline, counting what actually went out
+    while sent[0] < UPLOAD_BYTES and time.monotonic() < deadline and not stop_event.is_set():
+        sent[0] += CHUNK_BYTES
+        yield _upload_chunk
+
+def get_speed_test():
+    try:
+        print("Starting speed test...")
+        # Minimum of two empty downloads, so a fresh connection's handshake doesn't count as latency
+        ping = min(_latency_ms() for _ in range(2))
+
+        start = time.monotonic()
+        deadline = start + TRANSFER_SECONDS
+        received = 0
+        with _session.get(DOWNLOAD_URL, params={'bytes': DOWNLOAD_BYTES}, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(CHUNK_BYTES):
+                received += len(chunk)
+                if time.monotonic() >= deadline or stop_event.is_set():
+                    break
+        download_speed = received * 8 / 1_000_000 / (time.monotonic() - start)
+
+        start = time.monotonic()
+        sent = [0]
+        _session.post(UPLOAD_URL, data=_upload_body(start + TRANSFER_SECONDS, sent), timeout=30).raise_for_status()
+        upload_speed = sent[0] * 8 / 1_000_000 / (time.monotonic() - start)
+        
+        return {
+            'download': round(download_speed, 2),
+            'upload': round(upload_speed, 2),
+            'ping': round(ping, 2)
+        }
+    except Exception as e:
+        print(f"Speed Test Error: {str(e)}")
+        return None
+
+# Keeps a CSV log open and writes buffered rows every `flush_every` rows
+class CsvAppender:
+    def __init__(self, filename, fieldnames, flush_every=16):
+        self.flush_every = flush_every
+        self.pending = 0
+        self.buffer = io.StringIO()
+        self.csvfile = open(filename, 'a', newline='')
+        self.writer = csv.DictWriter(self.buffer, fieldnames=fieldnames)
+        if self.csvfile.tell() == 0:
+            self.writer.writeheader()
+        atexit.register(self.close)
+
+    def write(self, data):
+        self.writer.writerow(data)
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.csvfile.write(self.buffer.getvalue())
+        self.csvfile.flush()
+        os.fsync(self.csvfile.fileno())
+        # Reuse the same buffer instead of allocating a new one per batch
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.pending = 0
+
+    def close(self):
+        if self.csvfile.closed:
+            return
+        self.flush()
+        self.csvfile.close()
+
+def speed_test_loop():
+    fieldnames = ['timestamp', 'download_mbps', 'upload_mbps', 'ping_ms']
+    # Speed tests only run every 2 minutes, so write each row straight away
+    speed_log = CsvAppender('speed_log2.csv', fieldnames, flush_every=1)
+    while not stop_event.is_set():
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        results = get_speed_test()
+        
+        if results:
+            data = {
+                'timestamp': timestamp,
+                'download_mbps': results['download'],
+                'upload_mbps': results['upload'],
+                'ping_ms': results['ping']
+            }
+            speed_log.write(data)
+            print(f"\n[{timestamp}] Speed Test:")
+            print(f"Download: {results['download']} Mbps")
+            print(f"Upload: {results['upload']} Mbps")
+            print(f"Ping: {results['ping']} ms")
+        
+        stop_event.wait(120)
+
+    speed_log.close()
+
+def ping_loop():
+    fieldnames = ['timestamp', 'min_ms', 'avg_ms', 'max_ms', 'packet_loss']
+    ping_log = CsvAppender('ping_log2.csv', fieldnames)
+    monitor = PingMonitor()
+    monitor.start()
+    while not stop_event.is_set():
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        results = monitor.get_ping_stats()
+        
+        if results:
+            data = {
+                'timestamp': timestamp,
+                'min_ms': round(results['min'], 2),
+                'avg_ms': round(results['avg'], 2),
+                'max_ms': round(results['max'], 2),
+                'packet_loss': round(results['packet_loss'], 2)
+            }
+            ping_log.write(data)
+            print(f"Ping: {data['avg_ms']}ms", end='\r')
+        
+        stop_event.wait(5)
+
+    monitor.stop()
+    ping_log.close()
+
+def report_failure(future):
+    # Pool futures swallow exceptions, print the traceback like a crashed thread would
+    if not future.cancelled() and future.exception() is not None:
+        print("\nLogging task stopped with an error:")
+        traceback.print_exception(future.exception())
+
+def main():
+    print("Starting network performance logging... Press Ctrl+C to stop.")
+    
+    loops = [executor.submit(speed_test_loop), executor.submit(ping_loop)]
+    for loop in loops:
+        loop.add_done_callback(report_failure)
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_event.set()
+        executor.shutdown(wait=False)
+        print("\nData collection stopped.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,106 +1,133 @@
-import gpxpy
+from array import array
+import numpy as np
 import pandas as pd
+from lxml import etree
 import matplotlib.pyplot as plt
-from datetime import timedelta
 from matplotlib.colors import LogNorm
 import contextily as ctx
-import geopandas as gpd
-from pyproj import CRS
+from pyproj import Transformer
 
 def load_gpx_data(gpx_file):
-    with open(gpx_file, 'r') as gpx_file:
-        gpx = gpxpy.parse(gpx_file)
-    
-    points = []
-    for track in gpx.tracks:
-        for segment in track.segments:
-            for point in segment.points:
-                # Adjust UTC time to local time (subtract 5 hours for EST)
-                local_time = point.time.replace(tzinfo=None) - timedelta(hours=7)
-                points.append({
-                    'timestamp': local_time,
-                    'latitude': point.latitude,
-                    'longitude': point.longitude
-                })
-    
-    return pd.DataFrame(points)
+    # float32 keeps ~1m precision, plenty for plotting, at half the memory of float64
+    latitudes = array('f')
+    longitudes = array('f')
+    times = []
+
+    # Stream trackpoints instead of building the whole GPX tree, any GPX namespace version
+    for _, point in etree.iterparse(gpx_file, tag='{*}trkpt'):
+        namespace = point.tag[:-len('trkpt')]
+        point_time = point.findtext(namespace + 'time')
+        # Points without a time can't be matched to pings
+        if point_time:
+            latitudes.append(float(point.get('lat')))
+            longitudes.append(float(point.get('lon')))
+            times.append(point_time)
+
+        # Drop processed points so memory stays flat on long tracks
+        point.clear()
+        while point.getprevious() is not None:
+            del point.getparent()[0]
+
+    # Adjust UTC time to local time (subtract 5 hours for EST)
+    local_times = pd.to_datetime(times, utc=True, format='ISO8601').tz_localize(None) - pd.Timedelta(hours=7)
+
+    return pd.DataFrame({
+        'timestamp': local_times,
+        'latitude': np.frombuffer(latitudes, dtype=np.float32),
+        'longitude': np.frombuffer(longitudes, dtype=np.float32)
+    })
 
 def load_ping_data(csv_file):
-    df = pd.read_csv(csv_file)
-    df['timestamp'] = pd.to_datetime(df['timestamp']) # convert timestamp to datatime object for ping data
-    return df
+    # pyarrow's multithreaded parser with a known schema, timestamps parsed during the read
+    return pd.read_csv(
+        csv_file,
+        engine='pyarrow',
+        dtype={'min_ms': 'float32', 'avg_ms': 'float32', 'max_ms': 'float32', 'packet_loss': 'float32'},
+        parse_dates=['timestamp']
+    )
 
 def match_ping_to_location(gpx_df, ping_df):
-    matched_data = []
-    for _, ping_row in ping_df.iterrows():
-        ping_time = ping_row['timestamp']
-        
-        # Find absolute time difference with all GPS points
-        time_diffs = abs(gpx_df['timestamp'] - ping_time)
-        closest_idx = time_diffs.argmin()
-        closest_point = gpx_df.iloc[closest_idx]
-        
-        matched_data.append({
-            'timestamp': ping_time,
-            'latitude': closest_point['latitude'],
-            'longitude': closest_point['longitude'],
-            'min_ms': ping_row['min_ms'],
-            'avg_ms': ping_row['avg_ms'],
-            'max_ms': ping_row['max_ms'],
-            'packet_loss': ping_row['packet_loss'],
-            'time_diff_seconds': time_diffs[closest_idx].total_seconds()
-        })
-    
-    return pd.DataFrame(matched_data)
+    gpx_df = gpx_df.sort_values('timestamp')
+    gps_ns = gpx_df['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+    ping_ns = ping_df['timestamp'].to_numpy(dtype='datetime64[ns]').view('i8')
+
+    # Binary search each ping into the GPS timeline, then keep whichever neighbouring fix is closer
+    idx = np.searchsorted(gps_ns, ping_ns)
+    left = np.clip(idx - 1, 0, len(gps_ns) - 1)
+    right = np.clip(idx, 0, len(gps_ns) - 1)
+    closest_idx = np.where(np.abs(gps_ns[left] - ping_ns) <= np.abs(gps_ns[right] - ping_ns), left, right)
+
+    return pd.DataFrame({
+        'timestamp': ping_df['timestamp'].to_numpy(),
+        'latitude': gpx_df['latitude'].to_numpy()[closest_idx],
+        'longitude': gpx_df['longitude'].to_numpy()[closest_idx],
+        'min_ms': ping_df['min_ms'].to_numpy(),
+        'avg_ms': ping_df['avg_ms'].to_numpy(),
+        'max_ms': ping_df['max_ms'].to_numpy(),
+        'packet_loss': ping_df['packet_loss'].to_numpy(),
+        'time_diff_seconds': np.abs(gps_ns[closest_idx] - ping_ns) / 1e9
+    })
 
 def fill_gaps_with_synthetic_data(df, threshold_seconds=7):
 
     df = df.sort_values('timestamp').copy()
-    synthetic_entries = []
-    
-    for i in range(len(df) - 1):
-        current_time = df.iloc[i]['timestamp']
-        next_time = df.iloc[i + 1]['timestamp']
-        time_diff = (next_time - current_time).total_seconds()
-        
-        if time_diff > threshold_seconds:
-            # Calculate number of missing entries
-            missing_intervals = int(time_diff / 5) - 1  # 5 seconds is normal interval
-
-            #  Adds synthetic data for each missing interval, assuming 100% packet loss to represent downtime.
-            for j in range(missing_intervals):
-                synthetic_time = current_time + timedelta(seconds=(j + 1) * 5)
-                synthetic_entries.append({
-                    'timestamp': synthetic_time,
-                    'min_ms': 4000,
-                    'avg_ms': 4000,
-                    'max_ms': 4000,
-                    'packet_loss': 100.0  # 100% packet loss
-                })
-    
-    
-    if synthetic_entries:
-        synthetic_df = pd.DataFrame(synthetic_entries)
+    timestamps = df['timestamp'].to_numpy()
+    time_diffs = np.diff(timestamps) / np.timedelta64(1, 's')
+
+    # Index of the entry right before each gap
+    gap_idx = np.flatnonzero(time_diffs > threshold_seconds)
+
+    # Calculate number of missing entries per gap, 5 seconds is normal interval
+    missing_intervals = np.maximum((time_diffs[gap_idx] / 5).astype(np.int64) - 1, 0)
+    total_missing = missing_intervals.sum()
+
+    if total_missing:
+        # Offsets 1..n within each gap, then step 5 seconds from the entry before the gap
+        steps = np.arange(total_missing) - np.repeat(missing_intervals.cumsum() - missing_intervals, missing_intervals) + 1
+        gap_start = np.repeat(timestamps[gap_idx], missing_intervals)
+
+        #  Adds synthetic data for each missing interval, assuming 100% packet loss to represent downtime.
+        synthetic_df = pd.DataFrame({
+            'timestamp': gap_start + steps * np.timedelta64(5, 's'),
+            'min_ms': 4000,
+            'avg_ms': 4000,
+            'max_ms': 4000,
+            'packet_loss': 100.0  # 100% packet loss
+        })
+        # Match the loaded column dtypes so the concat doesn't upcast them
+        synthetic_df = synthetic_df.astype({col: df[col].dtype for col in synthetic_df.columns})
         df = pd.concat([df, synthetic_df], ignore_index=True)
         df = df.sort_values('timestamp').reset_index(drop=True)
     
     return df
 
+def add_basemap(ax, basemap, extent):
+    # Draw pre-fetched basemap tiles under the data without changing the view limits
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+    ax.imshow(basemap, extent=extent, interpolation='bilinear')
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+
 gpx_file_paths = ["1strun.gpx", "run2.gpx"]
 ping_csv_paths = ["ping_log.csv", "ping_log2.csv"]
 
+# Above this many matched points the kriging overlay is hex-binned instead of scattered
+HEXBIN_MIN_POINTS = 2000
 
-gpx_df = pd.DataFrame()
-ping_df = pd.DataFrame()
+
+gpx_frames = []
+ping_frames = []
 
 
 for gpx_path, ping_path in zip(gpx_file_paths, ping_csv_paths):
-    current_gpx_df = load_gpx_data(gpx_path)
-    gpx_df = pd.concat([gpx_df, current_gpx_df], ignore_index=True)
+    gpx_frames.append(load_gpx_data(gpx_path))
 
     current_ping_df = load_ping_data(ping_path)
-    current_ping_df = fill_gaps_with_synthetic_data(current_ping_df)
-    ping_df = pd.concat([ping_df, current_ping_df], ignore_index=True)
+    ping_frames.append(fill_gaps_with_synthetic_data(current_ping_df))
+
+# Concatenate once so the combined frames are copied a single time
+gpx_df = pd.concat(gpx_frames, ignore_index=True)
+ping_df = pd.concat(ping_frames, ignore_index=True)
 
 # Sort both DataFrames by timestamp to ensure proper ordering
 gpx_df = gpx_df.sort_values('timestamp').reset_index(drop=True)
@@ -111,40 +138,47 @@ matched_data = match_ping_to_location(gpx_df, ping_df)
 
 matched_data = matched_data[matched_data["time_diff_seconds"] <= 10]
 
-gdf = gpd.GeoDataFrame(
-    matched_data, 
-    geometry=gpd.points_from_xy(matched_data.longitude, matched_data.latitude),
-    crs=CRS('EPSG:4326')
-)
-
-
-gdf = gdf.to_crs(epsg=3857)
+# Project lon/lat straight to Web Mercator arrays, no per-point geometry objects needed for plotting
+transformer = Transformer.from_crs(4326, 3857, always_xy=True)
+xs, ys = transformer.transform(matched_data['longitude'].to_numpy(), matched_data['latitude'].to_numpy())
+matched_data = matched_data.assign(x=xs, y=ys)
 
-bounds = gdf.geometry.total_bounds
-center_x = (bounds[0] + bounds[2]) / 2
-center_y = (bounds[1] + bounds[3]) / 2
-span = max(bounds[2] - bounds[0], bounds[3] - bounds[1])
+center_x = (xs.min() + xs.max()) / 2
+center_y = (ys.min() + ys.max()) / 2
+span = max(xs.max() - xs.min(), ys.max() - ys.min())
 padding = 1.2
+x_min, x_max = center_x - span / 2 * padding, center_x + span / 2 * padding
+y_min, y_max = center_y - span / 2 * padding, center_y + span / 2 * padding
+
+# Fetch basemap tiles once for all map axes, cached on disk between runs
+ctx.set_cache_dir('./.ctx_cache')
+basemap, basemap_extent = ctx.bounds2img(
+    x_min, y_min, x_max, y_max,
+    zoom='auto',
+    source=ctx.providers.CartoDB.Positron,
+    ll=False
+)
 
 fig, ax = plt.subplots(figsize=(12, 12))
 
-ax.set_xlim(center_x - span / 2 * padding, center_x + span / 2 * padding)
-ax.set_ylim(center_y - span / 2 * padding, center_y + span / 2 * padding)
+ax.set_xlim(x_min, x_max)
+ax.set_ylim(y_min, y_max)
 
 ax.set_aspect('equal')
 
 scatter = ax.scatter(
-    gdf.geometry.x,
-    gdf.geometry.y,
-    c=gdf['avg_ms'],
+    xs,
+    ys,
+    c=matched_data['avg_ms'],
     cmap='RdYlGn_r',
     s=100,
     alpha=0.6,
-    norm=LogNorm(vmin=10, vmax=4000)  # Log scale normalization for color
+    norm=LogNorm(vmin=10, vmax=4000),  # Log scale normalization for color
+    rasterized=True  # Flatten markers to one image instead of a vector path each
 )
 
 
-ctx.add_basemap(ax, source=ctx.providers.CartoDB.Positron)
+add_basemap(ax, basemap, basemap_extent)
 
 
 cbar = plt.colorbar(scatter, label='Average Ping (ms)')
@@ -164,13 +198,13 @@ fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 24))
 
 
 for ax in [ax1, ax2]:
-    ax.set_xlim(center_x - span/2 * padding, center_x + span/2 * padding)
-    ax.set_ylim(center_y - span/2 * padding, center_y + span/2 * padding)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
     ax.set_aspect('equal')
     ax.set_axis_off()
 
 # Perform kriging
-grid_xx, grid_yy, field, sigma = perform_ordinary_kriging(gdf)
+grid_xx, grid_yy, field, sigma = perform_ordinary_kriging(matched_data)
 
 # Plot 1: Interpolated values
 im1 = ax1.pcolormesh(
@@ -178,32 +212,50 @@ im1 = ax1.pcolormesh(
     cmap='RdYlGn_r',
     norm=LogNorm(vmin=10, vmax=4000),
     shading='auto',
-    alpha=0.5  # Reduced from 0.7
+    alpha=0.5,  # Reduced from 0.7
+    rasterized=True
 )
 
-scatter = ax1.scatter(
-    gdf.geometry.x,
-    gdf.geometry.y,
-    c=gdf['avg_ms'],
-    cmap='RdYlGn_r',
-    s=50,
-    alpha=0.4,  # Reduced from 0.6
-    norm=LogNorm(vmin=10, vmax=4000),
-    edgecolor='black',
-    linewidth=0.5
-)
+if len(matched_data) >= HEXBIN_MIN_POINTS:
+    # Bin dense point sets, overlapping markers add no information and cost a draw each
+    scatter = ax1.hexbin(
+        xs,
+        ys,
+        C=matched_data['avg_ms'].to_numpy(),
+        reduce_C_function=np.mean,
+        gridsize=80,
+        cmap='RdYlGn_r',
+        alpha=0.4,
+        norm=LogNorm(vmin=10, vmax=4000),
+        mincnt=1,
+        rasterized=True
+    )
+else:
+    scatter = ax1.scatter(
+        xs,
+        ys,
+        c=matched_data['avg_ms'],
+        cmap='RdYlGn_r',
+        s=50,
+        alpha=0.4,  # Reduced from 0.6
+        norm=LogNorm(vmin=10, vmax=4000),
+        edgecolor='black',
+        linewidth=0.5,
+        rasterized=True
+    )
 
 # Plot 2: Uncertainty
 im2 = ax2.pcolormesh(
     grid_xx, grid_yy, sigma,
     cmap='viridis',
     shading='auto',
-    alpha=0.5  # Reduced from 0.7
+    alpha=0.5,  # Reduced from 0.7
+    rasterized=True
 )
 
 
-ctx.add_basemap(ax1, source=ctx.providers.CartoDB.Positron)
-ctx.add_basemap(ax2, source=ctx.providers.CartoDB.Positron) 
+add_basemap(ax1, basemap, basemap_extent)
+add_basemap(ax2, basemap, basemap_extent)
 
 
 cbar1 = plt.colorbar(im1, ax=ax1, label='Average Ping (ms)', shrink=0.7)